@@ -0,0 +1,20 @@
+import pytest
+
+import dbt.adapters.snowflake.connections as connections
+
+
+@pytest.fixture(scope="session")
+def base_creds():
+    return {
+        "database": "test_database",
+        "warehouse": "test_warehouse",
+        "schema": "test_schema",
+    }
+
+
+@pytest.fixture
+def make_creds(base_creds):
+    def _make(**overrides):
+        return connections.SnowflakeCredentials(**{**base_creds, **overrides})
+
+    return _make
@@ -1,4 +1,3 @@
-import os
 import pytest
 from importlib import reload
 from unittest.mock import Mock, patch
@@ -9,52 +8,35 @@ import dbt.adapters.snowflake.connections as connections
 import dbt.adapters.events.logging
 
 
-def test_connections_sets_logs_in_response_to_env_var(monkeypatch):
-    """Test that setting the DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING environment variable happens on import"""
-    log_mock = Mock()
-    monkeypatch.setattr(dbt.adapters.events.logging, "AdapterLogger", Mock(return_value=log_mock))
-    monkeypatch.setattr(os, "environ", {"DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING": "true"})
-    reload(connections)
-
-    assert log_mock.debug.call_count == 3
-    assert log_mock.set_adapter_dependency_log_level.call_count == 3
-
+_MP_SPAWN = multiprocessing.get_context("spawn")
 
-def test_connections_does_not_set_logs_in_response_to_env_var(monkeypatch):
-    log_mock = Mock()
-    monkeypatch.setattr(dbt.adapters.events.logging, "AdapterLogger", Mock(return_value=log_mock))
-    reload(connections)
 
-    assert log_mock.debug.call_count == 0
-    assert log_mock.set_adapter_dependency_log_level.call_count == 0
+@pytest.fixture(autouse=True)
+def _clean_snowflake_env(monkeypatch):
+    monkeypatch.delenv("DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING", raising=False)
 
 
-def test_connnections_credentials_replaces_underscores_with_hyphens():
-    credentials = {
-        "account": "account_id_with_underscores",
-        "user": "user",
-        "password": "password",
-        "database": "database",
-        "warehouse": "warehouse",
-        "schema": "schema",
-    }
-    creds = connections.SnowflakeCredentials(**credentials)
-    assert creds.account == "account-id-with-underscores"
+@pytest.fixture
+def log_mock(monkeypatch):
+    m = Mock()
+    monkeypatch.setattr(dbt.adapters.events.logging, "AdapterLogger", Mock(return_value=m))
+    monkeypatch.setattr(connections, "logger", m)
+    return m
 
 
-def test_snowflake_oauth_expired_token_raises_error():
-    credentials = {
-        "account": "test_account",
-        "user": "test_user",
-        "authenticator": "oauth",
-        "token": "expired_or_incorrect_token",
-        "database": "database",
-        "schema": "schema",
-    }
+@pytest.fixture
+def oauth_manager(make_creds):
+    creds = make_creds(
+        account="test_account",
+        user="test_user",
+        authenticator="oauth",
+        token="expired_or_incorrect_token",
+    )
+    return connections.SnowflakeConnectionManager(creds, _MP_SPAWN)
 
-    mp_context = multiprocessing.get_context("spawn")
-    mock_credentials = connections.SnowflakeCredentials(**credentials)
 
+@pytest.fixture
+def expired_token_open():
     with patch.object(
         connections.SnowflakeConnectionManager,
         "open",
@@ -62,154 +44,121 @@ def test_snowflake_oauth_expired_token_raises_error():
             "This error occurs when authentication has expired. "
             "Please reauth with your auth provider."
         ),
-    ):
-
-        adapter = connections.SnowflakeConnectionManager(mock_credentials, mp_context)
-
-        with pytest.raises(FailedToConnectError):
-            adapter.open()
-
-
-def test_missing_account_raises_error():
-    """Test that missing account (neither in profile nor environment) raises an error"""
-    credentials = {
-        "user": "test_user",
-        "password": "test_password",
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(Exception):  # Should raise error for missing account
-            connections.SnowflakeCredentials(**credentials)
-
-
-def test_missing_user_for_password_auth_raises_error():
-    """Test that missing user for password auth raises an error (non-default authenticator)"""
-    credentials = {
-        "account": "test_account",
-        "password": "test_password",
-        "authenticator": "externalbrowser",  # Non-default authenticator
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(DbtConfigError, match=r"'user' is required for this authenticator"):
-            connections.SnowflakeCredentials(**credentials)
-
-
-def test_missing_user_for_oauth_auth_is_allowed():
-    """Test that missing user for oauth auth is allowed"""
-    credentials = {
-        "account": "test_account",
-        "authenticator": "oauth",
-        "token": "test_token",
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        creds = connections.SnowflakeCredentials(**credentials)
-        assert creds.user is None  # Should be None for oauth auth
-
-
-def test_missing_user_for_jwt_auth_is_allowed():
-    """Test that missing user for jwt auth is allowed"""
-    credentials = {
-        "account": "test_account",
-        "authenticator": "jwt",
-        "token": "test_token",
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        creds = connections.SnowflakeCredentials(**credentials)
-        assert creds.user is None  # Should be None for jwt auth
-
-
-def test_missing_account_for_default_authenticator_is_allowed():
+    ) as open_mock:
+        yield open_mock
+
+
+def _assert_dependency_logging_enabled(log_mock):
+    assert log_mock.debug.call_count == 3
+    assert log_mock.set_adapter_dependency_log_level.call_count == 3
+    for logger_name in ["snowflake.connector", "botocore", "boto3"]:
+        log_mock.debug.assert_any_call(f"Setting {logger_name} to DEBUG")
+        log_mock.set_adapter_dependency_log_level.assert_any_call(logger_name, "DEBUG")
+
+
+def test_connections_sets_logs_in_response_to_env_var(log_mock, monkeypatch):
+    """Test that setting the DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING environment variable enables dependency logging"""
+    monkeypatch.setenv("DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING", "true")
+    connections._configure_debug_logging()
+
+    _assert_dependency_logging_enabled(log_mock)
+
+
+def test_connections_does_not_set_logs_in_response_to_env_var(log_mock):
+    connections._configure_debug_logging()
+
+    log_mock.debug.assert_not_called()
+    log_mock.set_adapter_dependency_log_level.assert_not_called()
+
+
+@pytest.mark.slow
+def test_connections_sets_logs_in_response_to_env_var_on_import(log_mock, monkeypatch):
+    """Test that the DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING environment variable is honored on import"""
+    monkeypatch.setenv("DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING", "true")
+    reload(connections)
+
+    _assert_dependency_logging_enabled(log_mock)
+
+
+def test_connnections_credentials_replaces_underscores_with_hyphens(make_creds):
+    creds = make_creds(account="account_id_with_underscores", user="user", password="password")
+    assert creds.account == "account-id-with-underscores"
+
+
+@pytest.mark.usefixtures("expired_token_open")
+def test_snowflake_oauth_expired_token_raises_error(oauth_manager):
+    with pytest.raises(FailedToConnectError):
+        oauth_manager.open()
+
+
+def test_missing_account_raises_error(make_creds):
+    """Test that missing account in the profile raises an error"""
+    with pytest.raises(DbtConfigError, match=r"'account' is required"):
+        make_creds(user="test_user", password="test_password")
+
+
+def test_missing_account_for_default_authenticator_is_allowed(make_creds):
     """Test that missing account is allowed only for default authenticator (None)"""
-    credentials = {
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-        "role": "test_role",
-        # No authenticator specified, so it defaults to None
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        creds = connections.SnowflakeCredentials(**credentials)
-        assert creds.account is None  # Should be None when not provided
-        assert creds.authenticator is None  # Default authenticator
-        assert creds.unique_field == "default"  # Should use default for unique_field
-
-
-def test_missing_account_for_oauth_raises_error():
-    """Test that missing account for oauth raises an error"""
-    credentials = {
-        "authenticator": "oauth",
-        "token": "test_token",
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(DbtConfigError, match=r"'account' is required when using oauth or jwt"):
-            connections.SnowflakeCredentials(**credentials)
-
-
-def test_missing_account_for_jwt_raises_error():
-    """Test that missing account for jwt raises an error"""
-    credentials = {
-        "authenticator": "jwt",
-        "token": "test_token",
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(DbtConfigError, match=r"'account' is required when using oauth or jwt"):
-            connections.SnowflakeCredentials(**credentials)
-
-
-def test_missing_account_and_user_allowed_for_default_auth_without_password():
+    # No authenticator specified, so it defaults to None
+    creds = make_creds(role="test_role")
+    assert creds.account is None  # Should be None when not provided
+    assert creds.authenticator is None  # Default authenticator
+    assert creds.unique_field == "default"  # Should use default for unique_field
+
+
+def test_missing_account_and_user_allowed_for_default_auth_without_password(make_creds):
     """Test that both account and user can be omitted for default authenticator without password (user's scenario)"""
-    credentials = {
-        "database": "NJOGI_DB",
-        "schema": "PUBLIC",
-        "role": "PUBLIC",
-        "warehouse": "TEST_WAREHOUSE_DBT",
-        # No authenticator (defaults to None) and no password
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        creds = connections.SnowflakeCredentials(**credentials)
-        assert creds.account is None
+    # No authenticator (defaults to None) and no password
+    creds = make_creds(role="PUBLIC")
+    assert creds.account is None
+    assert creds.user is None
+    assert creds.authenticator is None  # Default authenticator
+    assert creds.password is None  # No password provided
+    assert creds.unique_field == "default"
+
+
+@pytest.mark.parametrize(
+    "overrides,error_match",
+    [
+        pytest.param(
+            dict(
+                account="test_account", password="test_password", authenticator="externalbrowser"
+            ),
+            r"'user' is required for this authenticator",
+            id="externalbrowser-missing-user",
+        ),
+        pytest.param(
+            dict(account="test_account", authenticator="oauth", token="test_token"),
+            None,
+            id="oauth-missing-user-allowed",
+        ),
+        pytest.param(
+            dict(account="test_account", authenticator="jwt", token="test_token"),
+            None,
+            id="jwt-missing-user-allowed",
+        ),
+        pytest.param(
+            dict(authenticator="oauth", token="test_token"),
+            r"'account' is required when using oauth or jwt",
+            id="oauth-missing-account",
+        ),
+        pytest.param(
+            dict(authenticator="jwt", token="test_token"),
+            r"'account' is required when using oauth or jwt",
+            id="jwt-missing-account",
+        ),
+        pytest.param(
+            dict(account="test_account", password="test_password"),
+            r"'user' is required for this authenticator",
+            id="default-with-password-missing-user",
+        ),
+    ],
+)
+def test_credential_validation(make_creds, overrides, error_match):
+    """Test which missing account/user combinations are rejected for each authenticator"""
+    if error_match is None:
+        creds = make_creds(**overrides)
         assert creds.user is None
-        assert creds.authenticator is None  # Default authenticator
-        assert creds.password is None  # No password provided
-        assert creds.unique_field == "default"
-
-
-def test_missing_user_for_default_auth_with_password_raises_error():
-    """Test that missing user for default authenticator WITH password raises an error"""
-    credentials = {
-        "account": "test_account",
-        "password": "test_password",
-        # No authenticator specified, defaults to None (password auth)
-        "database": "test_database",
-        "warehouse": "test_warehouse",
-        "schema": "test_schema",
-    }
-
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(DbtConfigError, match=r"'user' is required for this authenticator"):
-            connections.SnowflakeCredentials(**credentials)
+    else:
+        with pytest.raises(DbtConfigError, match=error_match):
+            make_creds(**overrides)